@@ -1,16 +1,37 @@
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import cached_property, lru_cache, partial
+from typing import List, Dict, Optional, Sequence
 from enum import Enum
+import copy
+import hashlib
+import importlib.util
+import json
 import os
+import tempfile
+import time
 from datetime import datetime, timedelta
-import requests
+import aiohttp
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import anthropic
 from facebook_business.adobjects.adaccount import AdAccount
-from facebook_business.adobjects.adset import AdSet
-from facebook_business.adobjects.ad import Ad
 from facebook_business.api import FacebookAdsApi
 from facebook_business.adobjects.adimage import AdImage
 from facebook_business.adobjects.advideo import AdVideo
+from facebook_business.session import FacebookSession
+
+GRAPH_BATCH_LIMIT = 50
+GRAPH_BATCH_RETRIES = 3
+VIDEO_READY_ATTEMPTS = 30
+PRODUCT_URL_SUFFIXES = (
+    ('sales', ''),
+    ('product', '?dp=1'),
+    ('checkout', '?ap=838e'),
+    ('order_bump', '?ap=25f0'),
+)
 
 
 class CampaignObjective(str, Enum):
@@ -36,7 +57,7 @@ class BidStrategy(str, Enum):
     COST_CAP = 'COST_CAP'
 
 
-@dataclass
+@dataclass(slots=True)
 class Placement:
     platform: str
     position: str
@@ -44,22 +65,22 @@ class Placement:
     enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class AudienceTargeting:
     age_range: tuple = (18, 65)
-    genders: List[int] = None
-    languages: List[str] = None
-    locations: List[str] = None
-    interests: List[str] = None
-    behaviors: List[str] = None
-    demographics: List[str] = None
-    excluded_interests: List[str] = None
-    custom_audiences: List[str] = None
-    lookalike_audiences: List[str] = None
-    excluded_custom_audiences: List[str] = None
-
-
-@dataclass
+    genders: Sequence[int] = field(default_factory=tuple)
+    languages: Sequence[str] = field(default_factory=tuple)
+    locations: Sequence[str] = field(default_factory=tuple)
+    interests: Sequence[str] = field(default_factory=tuple)
+    behaviors: Sequence[str] = field(default_factory=tuple)
+    demographics: Sequence[str] = field(default_factory=tuple)
+    excluded_interests: Sequence[str] = field(default_factory=tuple)
+    custom_audiences: Sequence[str] = field(default_factory=tuple)
+    lookalike_audiences: Sequence[str] = field(default_factory=tuple)
+    excluded_custom_audiences: Sequence[str] = field(default_factory=tuple)
+
+
+@dataclass(slots=True)
 class AdCreative:
     primary_text: str
     headline: str
@@ -69,9 +90,10 @@ class AdCreative:
     video_id: Optional[str] = None
     link_destination: Optional[str] = None
     display_link: Optional[str] = None
+    thumbnail_url: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AdSetParameters:
     name: str
     optimization_goal: OptimizationGoal
@@ -86,7 +108,7 @@ class AdSetParameters:
     placements: List[Placement] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FacebookCampaignParameters:
     name: str
     objective: CampaignObjective
@@ -106,7 +128,7 @@ class FacebookCampaignParameters:
     campaign_rules: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class HotmartProduct:
     name: str
     base_url: str
@@ -117,54 +139,99 @@ class HotmartProduct:
     images: List[str]
     videos: Optional[List[str]] = None
     testimonials: Optional[List[Dict]] = None
+    urls: Dict[str, str] = field(init=False, repr=False)
 
     def __post_init__(self):
         self.urls = {
-            'sales': self.base_url,
-            'product': f"{self.base_url}?dp=1",
-            'checkout': f"{self.base_url}?ap=838e",
-            'order_bump': f"{self.base_url}?ap=25f0",
+            name: self.base_url + suffix for name, suffix in PRODUCT_URL_SUFFIXES
         }
 
 
+class GraphRetry(Retry):
+    # Graph API creates are not idempotent and a batch POST can create up to 50
+    # objects, so POSTs are only replayed when Facebook did not process them.
+    POST_RETRY_STATUSES = frozenset({429, 503})
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == 'POST':
+            return status_code in self.POST_RETRY_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+@lru_cache(maxsize=4)
+def _get_anthropic(api_key: str) -> anthropic.Anthropic:
+    return anthropic.Anthropic(
+        api_key=api_key,
+        http_client=httpx.Client(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            http2=True,
+            timeout=60.0,
+        ),
+    )
+
+
 class MediaManager:
     def __init__(self, ad_account):
         self.ad_account = ad_account
         self.uploaded_media = {}
+        if importlib.util.find_spec('h2') is None:
+            raise ImportError(
+                "HTTP/2 image downloads require the h2 package: "
+                "pip install 'httpx[http2]'"
+            )
+        self.http = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            ),
+            timeout=httpx.Timeout(60.0, connect=3.0),
+        )
+
+    def close(self):
+        self.http.close()
 
     def upload_media(self, media_urls: Dict[str, List[str]]) -> Dict[str, List[str]]:
         media_ids = {'images': [], 'videos': []}
-
-        if media_urls.get('images'):
-            for image_url in media_urls['images']:
-                image_id = self._upload_image(image_url)
-                if image_id:
-                    media_ids['images'].append(image_id)
-
-        if media_urls.get('videos'):
-            for video_url in media_urls['videos']:
-                video_id = self._upload_video(video_url)
-                if video_id:
-                    media_ids['videos'].append(video_id)
+        items = [
+            (kind, url) for kind in media_ids for url in media_urls.get(kind) or []
+        ]
+        if not items:
+            return media_ids
+
+        uploaders = {'images': self._upload_image, 'videos': self._upload_video}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(uploaders[kind], url) for kind, url in items]
+            for (kind, _), future in zip(items, futures):
+                media_id = future.result()
+                if media_id:
+                    media_ids[kind].append(media_id)
 
         return media_ids
 
     def _upload_image(self, image_url: str) -> Optional[str]:
         try:
-            response = requests.get(image_url)
-            image_hash = AdImage(parent_id=self.ad_account.get_id()).remote_create(
-                params={'bytes': response.content}
-            )
-            return image_hash['hash']
+            with self.http.stream(
+                'GET', image_url
+            ) as response, tempfile.NamedTemporaryFile(
+                suffix=os.path.splitext(image_url.split('?')[0])[1]
+            ) as buffer:
+                response.raise_for_status()
+                for chunk in response.iter_bytes(chunk_size=65536):
+                    buffer.write(chunk)
+                buffer.flush()
+
+                image = AdImage(parent_id=self.ad_account.get_id())
+                image[AdImage.Field.filename] = buffer.name
+                image.remote_create()
+            return image[AdImage.Field.hash]
         except Exception as e:
             print(f"Error uploading image {image_url}: {e}")
             return None
 
     def _upload_video(self, video_url: str) -> Optional[str]:
         try:
-            video = AdVideo(parent_id=self.ad_account.get_id()).remote_create(
-                params={'file_url': video_url}
-            )
+            video = self.ad_account.create_ad_video(params={'file_url': video_url})
             return video['id']
         except Exception as e:
             print(f"Error uploading video {video_url}: {e}")
@@ -173,14 +240,43 @@ class MediaManager:
 
 class FacebookCampaignManager:
     def __init__(self, access_token: str, ad_account_id: str, claude_api_key: str):
-        self.claude = anthropic.Anthropic(api_key=claude_api_key)
-        FacebookAdsApi.init(access_token=access_token)
+        self.page_id = os.getenv('FB_PAGE_ID')
+        if not self.page_id:
+            raise ValueError("FB_PAGE_ID environment variable is not set")
+        self._story_base = {'page_id': self.page_id}
+        self._claude_key = claude_api_key
+        self._access_token = access_token
+        api = FacebookAdsApi.init(access_token=access_token)
+        api._session.requests.mount(
+            'https://',
+            HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=20,
+                max_retries=GraphRetry(
+                    total=5,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    allowed_methods=['GET'],
+                    raise_on_status=False,
+                ),
+            ),
+        )
         self.ad_account = AdAccount(ad_account_id)
         self.media_manager = MediaManager(self.ad_account)
+        self._video_ready: Dict[str, bool] = {}
+        self._targeting_cache: Dict[int, tuple] = {}
+
+    def close(self):
+        self.media_manager.close()
+
+    @cached_property
+    def claude(self) -> anthropic.Anthropic:
+        return _get_anthropic(self._claude_key)
 
     def create_campaign(
         self, product: HotmartProduct, campaign_params: FacebookCampaignParameters
     ):
+        self._run_stamp = datetime.now().strftime('%Y%m%d')
         media_ids = self.media_manager.upload_media(
             {
                 'images': product.images,
@@ -190,9 +286,53 @@ class FacebookCampaignManager:
 
         campaign = self._create_base_campaign(product, campaign_params)
 
+        ad_creatives = self._create_creatives(
+            campaign_params.ad_creatives, product, media_ids
+        )
+
+        campaign_id = campaign.get_id()
         for ad_set_params in campaign_params.ad_sets:
-            adset = self._create_adset(campaign, ad_set_params, product)
-            self._create_ads(adset, campaign_params.ad_creatives, product, media_ids)
+            adset = self._create_adset(campaign_id, ad_set_params, product)
+            self._create_ads(adset.get_id(), ad_creatives)
+
+        return campaign
+
+    async def create_campaign_async(
+        self, product: HotmartProduct, campaign_params: FacebookCampaignParameters
+    ):
+        self._run_stamp = datetime.now().strftime('%Y%m%d')
+        media_ids = await asyncio.to_thread(
+            self.media_manager.upload_media,
+            {
+                'images': product.images,
+                'videos': product.videos if product.videos else [],
+            },
+        )
+
+        campaign = await asyncio.to_thread(
+            self._create_base_campaign, product, campaign_params
+        )
+
+        ad_creatives = await asyncio.to_thread(
+            self._create_creatives, campaign_params.ad_creatives, product, media_ids
+        )
+
+        campaign_id = campaign.get_id()
+        connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(
+                *(
+                    self._create_adset_async(
+                        session, campaign_id, ad_set_params, ad_creatives
+                    )
+                    for ad_set_params in campaign_params.ad_sets
+                ),
+                return_exceptions=True,
+            )
+
+        for ad_set_params, result in zip(campaign_params.ad_sets, results):
+            if isinstance(result, Exception):
+                print(f"Error creating ad set {ad_set_params.name}: {result}")
 
         return campaign
 
@@ -201,130 +341,258 @@ class FacebookCampaignManager:
     ):
         return self.ad_account.create_campaign(
             params={
-                'name': f"{params.name}_{datetime.now().strftime('%Y%m%d')}",
-                'objective': params.objective.value,
+                'name': f"{params.name}_{self._run_stamp}",
+                'objective': params.objective,
                 'status': params.status,
                 'special_ad_categories': params.special_ad_categories or [],
                 'daily_budget': params.daily_budget * 100,
-                'bid_strategy': params.bid_strategy.value,
+                'bid_strategy': params.bid_strategy,
                 'buying_type': params.buying_type,
             }
         )
 
-    def _create_adset(self, campaign, params: AdSetParameters, product: HotmartProduct):
-        return AdSet(parent_id=campaign.get_id()).create(
-            params={
-                'name': params.name,
-                'campaign_id': campaign.get_id(),
-                'daily_budget': params.daily_budget * 100,
-                'optimization_goal': params.optimization_goal.value,
-                'billing_event': params.billing_event,
-                'bid_strategy': params.bid_strategy.value,
-                'targeting': self._build_targeting_spec(params.targeting),
-                'start_time': params.start_time,
-                'end_time': params.end_time,
-                'status': 'PAUSED',
-            }
+    def _create_adset(
+        self, campaign_id: str, params: AdSetParameters, product: HotmartProduct
+    ):
+        return self.ad_account.create_ad_set(
+            params=self._adset_params(campaign_id, params)
         )
 
+    async def _create_adset_async(
+        self,
+        session: aiohttp.ClientSession,
+        campaign_id: str,
+        params: AdSetParameters,
+        ad_creatives: List[tuple],
+    ):
+        try:
+            async with session.post(
+                f'{FacebookSession.GRAPH}/{FacebookAdsApi.API_VERSION}/'
+                f'{self.ad_account.get_id()}/adsets',
+                data=self._graph_form(self._adset_params(campaign_id, params)),
+            ) as response:
+                try:
+                    result = await response.json()
+                except aiohttp.ContentTypeError:
+                    response.raise_for_status()
+                    raise
+        except aiohttp.ClientError as e:
+            print(f"Error creating ad set {params.name}: {e}")
+            return
+
+        if 'error' in result:
+            print(f"Error creating ad set {params.name}: {result['error']}")
+            return
+
+        await asyncio.to_thread(self._create_ads, result['id'], ad_creatives)
+
+    def _adset_params(self, campaign_id: str, params: AdSetParameters) -> dict:
+        return {
+            'name': params.name,
+            'campaign_id': campaign_id,
+            'daily_budget': params.daily_budget * 100,
+            'optimization_goal': params.optimization_goal,
+            'billing_event': params.billing_event,
+            'bid_strategy': params.bid_strategy,
+            'targeting': self._build_targeting_spec(params.targeting),
+            'start_time': params.start_time,
+            'end_time': params.end_time,
+            'status': 'PAUSED',
+        }
+
+    def _graph_form(self, params: dict) -> dict:
+        form = {'access_token': self._access_token}
+        for key, value in params.items():
+            if value is not None:
+                form[key] = value if isinstance(value, str) else json.dumps(value)
+        return form
+
     def _build_targeting_spec(self, targeting: AudienceTargeting) -> dict:
+        # Keep the targeting object alongside its spec so its id() can't be reused.
+        cached = self._targeting_cache.get(id(targeting))
+        if cached is not None and cached[0] is targeting:
+            return copy.copy(cached[1])
+
         spec = {
             'age_min': targeting.age_range[0],
             'age_max': targeting.age_range[1],
             'genders': targeting.genders,
-            'geo_locations': {'countries': targeting.locations},
-        }
-
-        if targeting.interests:
-            spec['interests'] = [{'id': interest} for interest in targeting.interests]
-
-        if targeting.behaviors:
-            spec['behaviors'] = [{'id': behavior} for behavior in targeting.behaviors]
-
-        if targeting.custom_audiences:
-            spec['custom_audiences'] = [
+            'geo_locations': (
+                {'countries': targeting.locations} if targeting.locations else None
+            ),
+            'interests': [{'id': interest} for interest in targeting.interests],
+            'behaviors': [{'id': behavior} for behavior in targeting.behaviors],
+            'custom_audiences': [
                 {'id': audience} for audience in targeting.custom_audiences
-            ]
-
-        if targeting.excluded_custom_audiences:
-            spec['excluded_custom_audiences'] = [
+            ],
+            'excluded_custom_audiences': [
                 {'id': audience} for audience in targeting.excluded_custom_audiences
-            ]
+            ],
+        }
+        spec = {key: value for key, value in spec.items() if value}
 
-        return spec
+        self._targeting_cache[id(targeting)] = (targeting, spec)
+        return copy.copy(spec)
 
-    def _create_ads(
+    def _create_creatives(
         self,
-        adset,
         creatives: List[AdCreative],
         product: HotmartProduct,
         media_ids: Dict[str, List[str]],
-    ):
+    ) -> List[tuple]:
+        ads = []
+        video_ids = [
+            video_id
+            for video_id in media_ids['videos']
+            if self._wait_video_ready(video_id)
+        ]
         for creative in creatives:
             for image_hash in media_ids['images']:
-                self._create_image_ad(adset, creative, product, image_hash)
-
-            for video_id in media_ids['videos']:
-                self._create_video_ad(adset, creative, product, video_id)
+                ads.append(
+                    (
+                        f'Ad_Image_{self._run_stamp}',
+                        self._image_creative_params(creative, product, image_hash),
+                    )
+                )
 
-    def _create_image_ad(
-        self, adset, creative: AdCreative, product: HotmartProduct, image_hash: str
-    ):
-        ad_creative = self.ad_account.create_ad_creative(
-            params={
-                'name': f'Creative_{datetime.now().strftime("%Y%m%d")}',
-                'object_story_spec': {
-                    'page_id': os.getenv('FB_PAGE_ID'),
-                    'link_data': {
-                        'link': creative.link_destination or product.urls['sales'],
-                        'message': creative.primary_text,
-                        'headline': creative.headline,
-                        'description': creative.description,
-                        'image_hash': image_hash,
-                        'call_to_action': {'type': creative.call_to_action},
+            for video_id in video_ids:
+                ads.append(
+                    (
+                        f'Ad_Video_{self._run_stamp}',
+                        self._video_creative_params(creative, product, video_id),
+                    )
+                )
+
+        creative_keys = [
+            self._creative_key(creative_params) for _, creative_params in ads
+        ]
+        unique_creatives = {
+            key: creative_params
+            for key, (_, creative_params) in zip(creative_keys, ads)
+        }
+        created_ids = self._execute_batched(
+            (
+                f"creative {creative_params['name']}",
+                partial(self.ad_account.create_ad_creative, params=creative_params),
+            )
+            for creative_params in unique_creatives.values()
+        )
+        creative_ids = dict(zip(unique_creatives, created_ids))
+
+        return [
+            (ad_name, creative_ids[key])
+            for (ad_name, _), key in zip(ads, creative_keys)
+            if creative_ids[key]
+        ]
+
+    def _create_ads(self, adset_id: str, ad_creatives: List[tuple]):
+        self._execute_batched(
+            (
+                f"ad {ad_name}",
+                partial(
+                    self.ad_account.create_ad,
+                    params={
+                        'name': ad_name,
+                        'adset_id': adset_id,
+                        'creative': {'creative_id': creative_id},
+                        'status': 'PAUSED',
                     },
-                },
-            }
+                ),
+            )
+            for ad_name, creative_id in ad_creatives
         )
 
-        Ad(parent_id=adset.get_id()).create(
-            params={
-                'name': f'Ad_Image_{datetime.now().strftime("%Y%m%d")}',
-                'adset_id': adset.get_id(),
-                'creative': {'creative_id': ad_creative.get_id()},
-                'status': 'PAUSED',
-            }
-        )
+    def _creative_key(self, creative_params: dict) -> str:
+        return hashlib.blake2b(
+            json.dumps(creative_params['object_story_spec'], sort_keys=True).encode(),
+            digest_size=16,
+        ).hexdigest()
 
-    def _create_video_ad(
-        self, adset, creative: AdCreative, product: HotmartProduct, video_id: str
-    ):
-        ad_creative = self.ad_account.create_ad_creative(
-            params={
-                'name': f'Creative_Video_{datetime.now().strftime("%Y%m%d")}',
-                'object_story_spec': {
-                    'page_id': os.getenv('FB_PAGE_ID'),
-                    'video_data': {
-                        'video_id': video_id,
-                        'call_to_action': {'type': creative.call_to_action},
-                        'image_url': creative.thumbnail_url,
-                        'title': creative.headline,
-                        'message': creative.primary_text,
-                        'description': creative.description,
-                        'link_description': creative.description,
-                    },
+    def _wait_video_ready(self, video_id: str) -> bool:
+        if video_id not in self._video_ready:
+            self._video_ready[video_id] = self._poll_video_status(video_id)
+        return self._video_ready[video_id]
+
+    def _poll_video_status(self, video_id: str) -> bool:
+        try:
+            for attempt in range(VIDEO_READY_ATTEMPTS):
+                video = AdVideo(video_id).api_get(fields=[AdVideo.Field.status])
+                status = video[AdVideo.Field.status].get('video_status')
+                if status == 'ready':
+                    return True
+                if status == 'error':
+                    break
+                time.sleep(min(2**attempt, 10))
+        except Exception as e:
+            print(f"Error checking video {video_id}: {e}")
+
+        print(f"Video {video_id} is not ready for ads, skipping it")
+        return False
+
+    def _execute_batched(self, calls) -> List[Optional[str]]:
+        calls = list(calls)
+        object_ids = [None] * len(calls)
+
+        def on_success(index, response):
+            object_ids[index] = response.json()['id']
+
+        def on_failure(index, response):
+            print(f"Error creating {calls[index][0]}: {response.error()}")
+
+        api = FacebookAdsApi.get_default_api()
+        for start in range(0, len(calls), GRAPH_BATCH_LIMIT):
+            batch = api.new_batch()
+            for index in range(start, min(start + GRAPH_BATCH_LIMIT, len(calls))):
+                calls[index][1](
+                    batch=batch,
+                    success=partial(on_success, index),
+                    failure=partial(on_failure, index),
+                )
+            for _ in range(GRAPH_BATCH_RETRIES):
+                batch = batch.execute()
+                if not batch:
+                    break
+            else:
+                print(f"Giving up on {len(batch)} batch requests without a response")
+
+        return object_ids
+
+    def _image_creative_params(
+        self, creative: AdCreative, product: HotmartProduct, image_hash: str
+    ) -> dict:
+        return {
+            'name': f'Creative_{self._run_stamp}',
+            'object_story_spec': {
+                **self._story_base,
+                'link_data': {
+                    'link': creative.link_destination or product.urls['sales'],
+                    'message': creative.primary_text,
+                    'headline': creative.headline,
+                    'description': creative.description,
+                    'image_hash': image_hash,
+                    'call_to_action': {'type': creative.call_to_action},
                 },
-            }
-        )
+            },
+        }
 
-        Ad(parent_id=adset.get_id()).create(
-            params={
-                'name': f'Ad_Video_{datetime.now().strftime("%Y%m%d")}',
-                'adset_id': adset.get_id(),
-                'creative': {'creative_id': ad_creative.get_id()},
-                'status': 'PAUSED',
-            }
-        )
+    def _video_creative_params(
+        self, creative: AdCreative, product: HotmartProduct, video_id: str
+    ) -> dict:
+        video_data = {
+            'video_id': video_id,
+            'call_to_action': {'type': creative.call_to_action},
+            'title': creative.headline,
+            'message': creative.primary_text,
+            'description': creative.description,
+            'link_description': creative.description,
+        }
+        if creative.thumbnail_url:
+            video_data['image_url'] = creative.thumbnail_url
+
+        return {
+            'name': f'Creative_Video_{self._run_stamp}',
+            'object_story_spec': {**self._story_base, 'video_data': video_data},
+        }
 
 
 if __name__ == '__main__':
@@ -332,6 +600,16 @@ if __name__ == '__main__':
 
     load_dotenv()
 
+    base_targeting = AudienceTargeting(
+        age_range=(25, 55),
+        genders=(1, 2),
+        languages=('EN',),
+        locations=('US', 'CA', 'UK', 'AU'),
+    )
+
+    def targeting(**overrides) -> AudienceTargeting:
+        return replace(base_targeting, **overrides)
+
     product = HotmartProduct(
         name="Digital Marketing Mastery",
         base_url="https://go.hotmart.com/M97671048E",
@@ -357,26 +635,14 @@ if __name__ == '__main__':
         daily_budget=50.0,
         bid_strategy=BidStrategy.LOWEST_COST_WITH_BID_CAP,
         pixel_id=os.getenv('FB_PIXEL_ID'),
-        cold_audience=AudienceTargeting(
-            age_range=(25, 55),
-            genders=[1, 2],
-            languages=['EN'],
-            locations=['US', 'CA', 'UK', 'AU'],
-            interests=['digital marketing', 'online business', 'entrepreneurship'],
+        cold_audience=targeting(
+            interests=('digital marketing', 'online business', 'entrepreneurship'),
         ),
-        warm_audience=AudienceTargeting(
-            age_range=(25, 55),
-            genders=[1, 2],
-            languages=['EN'],
-            locations=['US', 'CA', 'UK', 'AU'],
-            custom_audiences=[os.getenv('WEBSITE_VISITORS_AUDIENCE_ID')],
+        warm_audience=targeting(
+            custom_audiences=(os.getenv('WEBSITE_VISITORS_AUDIENCE_ID'),),
         ),
-        hot_audience=AudienceTargeting(
-            age_range=(25, 55),
-            genders=[1, 2],
-            languages=['EN'],
-            locations=['US', 'CA', 'UK', 'AU'],
-            custom_audiences=[os.getenv('CART_ABANDONERS_AUDIENCE_ID')],
+        hot_audience=targeting(
+            custom_audiences=(os.getenv('CART_ABANDONERS_AUDIENCE_ID'),),
         ),
         ad_sets=[
             AdSetParameters(
@@ -385,9 +651,8 @@ if __name__ == '__main__':
                 billing_event='IMPRESSIONS',
                 bid_strategy=BidStrategy.LOWEST_COST_WITHOUT_CAP,
                 daily_budget=20.0,
-                targeting=AudienceTargeting(
-                    age_range=(25, 55),
-                    interests=['digital marketing', 'online business'],
+                targeting=targeting(
+                    interests=('digital marketing', 'online business'),
                 ),
                 placements=[
                     Placement(
@@ -406,10 +671,8 @@ if __name__ == '__main__':
                 billing_event='IMPRESSIONS',
                 bid_strategy=BidStrategy.LOWEST_COST_WITH_BID_CAP,
                 daily_budget=15.0,
-                targeting=AudienceTargeting(
-                    custom_audiences=[os.getenv('WEBSITE_VISITORS_AUDIENCE_ID')],
-                    age_range=(25, 55),
-                    locations=['US', 'CA', 'UK', 'AU'],
+                targeting=targeting(
+                    custom_audiences=(os.getenv('WEBSITE_VISITORS_AUDIENCE_ID'),),
                 ),
                 placements=[
                     Placement(
@@ -430,10 +693,8 @@ if __name__ == '__main__':
                 billing_event='IMPRESSIONS',
                 bid_strategy=BidStrategy.LOWEST_COST_WITH_BID_CAP,
                 daily_budget=15.0,
-                targeting=AudienceTargeting(
-                    custom_audiences=[os.getenv('CART_ABANDONERS_AUDIENCE_ID')],
-                    age_range=(25, 55),
-                    locations=['US', 'CA', 'UK', 'AU'],
+                targeting=targeting(
+                    custom_audiences=(os.getenv('CART_ABANDONERS_AUDIENCE_ID'),),
                 ),
                 placements=[
                     Placement(
@@ -503,6 +764,9 @@ if __name__ == '__main__':
         claude_api_key=os.getenv('CLAUDE_API_KEY'),
     )
 
-    campaign = fb_manager.create_campaign(product, campaign_params)
+    try:
+        campaign = fb_manager.create_campaign(product, campaign_params)
+    finally:
+        fb_manager.close()
     print(f"Campaign created successfully with ID: {campaign.get_id()}")
 